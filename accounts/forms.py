@@ -59,7 +59,14 @@ class CustomUserCreationForm(UserCreationForm):
 
     def clean_email(self):
         email = self.cleaned_data.get("email")
-        if User.objects.filter(email=email).exists():
+        # Excluding blank emails matches the predicate of the partial unique
+        # index on UPPER(email), so PostgreSQL can use it for this lookup
+        if (
+            User.objects.exclude(email="")
+            .filter(email__iexact=email)
+            .only("pk")
+            .exists()
+        ):
             raise forms.ValidationError("This email is already in use.")
         return email
 
@@ -119,11 +126,19 @@ class UserEditForm(forms.ModelForm):
         """
         Validate the email field.
 
-        Check if a user with the same email address already exists.
+        Check if another user with the same email address (compared
+        case-insensitively) already exists. Blank emails are excluded, as in
+        the partial unique index on UPPER(email), so the index serves the
+        lookup.
         """
         email = self.cleaned_data.get("email")
-        user_id = self.instance.id
-        if User.objects.filter(email=email).exclude(id=user_id).exists():
+        if (
+            User.objects.exclude(pk=self.instance.pk)
+            .exclude(email="")
+            .filter(email__iexact=email)
+            .only("pk")
+            .exists()
+        ):
             raise forms.ValidationError("This email is already in use.")
         return email
 
@@ -151,24 +166,17 @@ class CustomPasswordChangeForm(PasswordChangeForm):
     new_password1 field.
     """
 
-    old_password = forms.CharField(
-        label="Old password",
-        strip=False,
-        widget=forms.PasswordInput(
-            attrs={"autocomplete": "current-password", "autofocus": True}
-        ),
-    )
-    new_password1 = forms.CharField(
-        label="New password",
-        strip=False,
-        widget=forms.PasswordInput(attrs={"autocomplete": "new-password"}),
-        help_text="Enter a strong password.",
-    )
-    new_password2 = forms.CharField(
-        label="New password confirmation",
-        strip=False,
-        widget=forms.PasswordInput(attrs={"autocomplete": "new-password"}),
-    )
+    new_password1_help_text = "Enter a strong password."
+
+    def __init__(self, *args, **kwargs):
+        """
+        Set the help text of the new_password1 field.
+
+        The fields themselves are inherited from PasswordChangeForm; only the
+        instance's copy is changed so the parent form is left untouched.
+        """
+        super().__init__(*args, **kwargs)
+        self.fields["new_password1"].help_text = self.new_password1_help_text
 
     def clean_old_password(self):
         """
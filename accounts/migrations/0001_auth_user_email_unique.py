@@ -0,0 +1,72 @@
+# Generated by Django 5.1 on 2026-10-15 09:12
+
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Upper
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """
+    Stop before creating the index if existing accounts share an email.
+
+    Emails were previously only compared case-sensitively at signup, and the
+    admin and createsuperuser don't check them at all, so older databases may
+    hold emails that differ only in case. Which account should keep the
+    address is a decision for an administrator, so the conflicting accounts
+    are listed instead of being changed here.
+    """
+    User = apps.get_model("auth", "User")
+
+    duplicate_emails = (
+        User.objects.exclude(email="")
+        .annotate(upper_email=Upper("email"))
+        .values("upper_email")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .values_list("upper_email", flat=True)
+    )
+    conflicts = (
+        User.objects.exclude(email="")
+        .annotate(upper_email=Upper("email"))
+        .filter(upper_email__in=list(duplicate_emails))
+        .order_by("upper_email", "id")
+        .values_list("id", "username", "email")
+    )
+    if conflicts:
+        accounts = "\n".join(
+            f"  id={user_id} username={username!r} email={email!r}"
+            for user_id, username, email in conflicts
+        )
+        raise RuntimeError(
+            "Cannot add the case-insensitive unique index on auth_user.email: "
+            "the following accounts share an email address (ignoring case). "
+            "Change or clear the emails so each is used by a single account, "
+            "then run migrate again.\n" + accounts
+        )
+
+
+class Migration(migrations.Migration):
+    """
+    Enforce case-insensitive uniqueness of user emails at the database level.
+
+    The index is built on UPPER(email) because that is what the ``iexact``
+    lookup compiles to on PostgreSQL. Blank emails are excluded so that users
+    created without an email address (e.g. via createsuperuser) don't collide.
+    Since the index is partial, a lookup can only use it when it also excludes
+    blank emails, which the ``clean_email`` checks do.
+    """
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.RunSQL(
+            sql=(
+                "CREATE UNIQUE INDEX auth_user_email_upper_uniq "
+                "ON auth_user (UPPER(email)) WHERE email <> ''"
+            ),
+            reverse_sql="DROP INDEX auth_user_email_upper_uniq",
+        ),
+    ]
@@ -6,13 +6,23 @@ from django.contrib.auth import login
 from django.contrib.auth import login as auth_login
 from django.contrib.auth.models import User
 from django.contrib.auth.views import LoginView, LogoutView, PasswordChangeView
+from django.db import IntegrityError, transaction
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
 from django.views.generic.edit import CreateView, UpdateView
 
 from .forms import (CustomAuthenticationForm, CustomPasswordChangeForm,
                     CustomUserCreationForm, UserEditForm)
 
+EDITABLE_USER_FIELDS = ("id", "username", "first_name", "last_name", "email")
+
+# Redirect targets shared by the views below
+USER_HOME_URL = reverse_lazy("main:user_home")
+LOGOUT_URL = reverse_lazy("accounts:logout")
+USER_PANEL_URL = reverse_lazy("accounts:user_panel")
+
 
 class CustomRegisterView(CreateView):
     """
@@ -24,16 +34,35 @@ class CustomRegisterView(CreateView):
 
     template_name = "register.html"
     form_class = CustomUserCreationForm
-    success_url = reverse_lazy("main:user_home")
+    success_url = USER_HOME_URL
 
     def form_valid(self, form):
         """
         Save the form and log the user in.
 
         After the form is valid, save the form and log the user in using the
-        ModelBackend.
+        ModelBackend. If a concurrent registration claimed the same email or
+        username between validation and saving, the database rejects the
+        insert and the error is reported on the matching field instead. Any
+        other integrity error is raised.
         """
-        user = form.save()
+        try:
+            with transaction.atomic():
+                user = form.save()
+        except IntegrityError:
+            email = form.cleaned_data.get("email")
+            username = form.cleaned_data.get("username")
+            users = User.objects.only("pk")
+            if email and users.filter(email__iexact=email).exclude(email="").exists():
+                form.add_error("email", "This email is already in use.")
+            elif username and users.filter(username=username).exists():
+                form.add_error(
+                    "username",
+                    User._meta.get_field("username").error_messages["unique"],
+                )
+            else:
+                raise
+            return self.form_invalid(form)
         login(self.request, user, backend="django.contrib.auth.backends.ModelBackend")
         return redirect(self.success_url)
 
@@ -71,13 +100,15 @@ class CustomLoginView(LoginView):
         """
         Return the URL to redirect to after the user has logged in.
 
-        If the user has specified a "next" URL in the request, use that.
+        If the user has specified a "next" URL in the request, use that,
+        checking the POST data first since logins are submitted by POST.
         Otherwise, use the url of the user_home view.
         """
-        next_url = self.request.GET.get("next") or self.request.POST.get("next")
-        if next_url:
-            return next_url
-        return reverse_lazy("main:user_home")
+        return (
+            self.request.POST.get("next")
+            or self.request.GET.get("next")
+            or USER_HOME_URL
+        )
 
 
 class CustomLogoutView(LogoutView):
@@ -85,47 +116,46 @@ class CustomLogoutView(LogoutView):
     Custom view for logging out users.
 
     Replaces the default LogoutView to provide a template for the logout
-    page.
+    page. Like the default view it only accepts POST requests, so the page is
+    only ever shown once the user has actually been logged out.
     """
 
     template_name = "logout.html"
-    next_page = reverse_lazy("accounts:logout")
-
-    def get(self, request, *args, **kwargs):
-        """
-        Handle GET requests to the logout page.
-
-        Redirect the user to the logout page.
-        """
-        return super().get(request, *args, **kwargs)
-
-    def post(self, request, *args, **kwargs):
-        """
-        Handle POST requests to the logout page.
-
-        Log the user out and redirect them to the logout page.
-        """
-        return super().post(request, *args, **kwargs)
+    next_page = LOGOUT_URL
 
 
+@method_decorator(
+    cache_control(private=True, max_age=0, no_store=True), name="dispatch"
+)
 class UserEditView(UpdateView):
     """
     Custom view for editing a user's details.
 
     This view extends the default UpdateView and is used to edit a user's
-    details in the user panel page.
+    details in the user panel page. The page contains personal details, so
+    it must not be stored by browsers or shared caches.
     """
 
     model = User
     form_class = UserEditForm
     template_name = "user_panel.html"
-    success_url = reverse_lazy("main:user_home")
+    success_url = USER_HOME_URL
 
     def get_object(self, queryset=None):
         """
         Return the user object to edit.
+
+        Load a separate copy of the current user limited to the fields on
+        the form, so an invalid submission doesn't leak into request.user and
+        saving only writes those fields. The copy is cached on the request.
         """
-        return self.request.user  # return the user object
+        user = getattr(self.request, "_cached_edit_user", None)
+        if user is None:
+            user = User.objects.only(*EDITABLE_USER_FIELDS).get(
+                pk=self.request.user.pk
+            )
+            self.request._cached_edit_user = user
+        return user
 
 
 class CustomPasswordChangeView(PasswordChangeView):
@@ -138,4 +168,4 @@ class CustomPasswordChangeView(PasswordChangeView):
 
     form_class = CustomPasswordChangeForm
     template_name = "password_change.html"
-    success_url = reverse_lazy("accounts:user_panel")
+    success_url = USER_PANEL_URL
@@ -1,17 +1,69 @@
 """
-Register all models from the main app in the admin interface.
+Register the models from the main app in the admin interface.
 
-This is a workaround for https://code.djangoproject.com/ticket/18151.
+Each ModelAdmin joins the relations its model's string representation follows,
+so the changelist doesn't issue a query per row, and uses raw ID widgets for
+foreign keys so the change form doesn't load every related row into a select.
 """
 
-from django.apps import apps
 from django.contrib import admin
 
-app_config = apps.get_app_config("main")
+from .models import (
+    Batch,
+    BatchIngredient,
+    Bottle,
+    BottleCounter,
+    FinishedProduct,
+    Ingredient,
+    ProcessEntry,
+    ProductLike,
+    SharedProduct,
+)
 
-# Register all models from the main app in the admin interface
-for model in app_config.get_models():
-    try:
-        admin.site.register(model)
-    except admin.sites.AlreadyRegistered:
-        pass
+admin.site.register(Ingredient)
+
+
+@admin.register(Batch)
+class BatchAdmin(admin.ModelAdmin):
+    list_select_related = ("creator",)
+    raw_id_fields = ("creator",)
+
+
+@admin.register(BatchIngredient)
+class BatchIngredientAdmin(admin.ModelAdmin):
+    list_select_related = ("ingredient",)
+    raw_id_fields = ("batch", "ingredient")
+
+
+@admin.register(ProcessEntry)
+class ProcessEntryAdmin(admin.ModelAdmin):
+    list_select_related = ("batch",)
+    raw_id_fields = ("batch",)
+
+
+@admin.register(FinishedProduct)
+class FinishedProductAdmin(admin.ModelAdmin):
+    raw_id_fields = ("batch", "creator")
+
+
+@admin.register(BottleCounter)
+class BottleCounterAdmin(admin.ModelAdmin):
+    raw_id_fields = ("finished_product",)
+
+
+@admin.register(Bottle)
+class BottleAdmin(admin.ModelAdmin):
+    list_select_related = ("finished_product",)
+    raw_id_fields = ("finished_product",)
+
+
+@admin.register(SharedProduct)
+class SharedProductAdmin(admin.ModelAdmin):
+    list_select_related = ("product", "shared_by")
+    raw_id_fields = ("product", "shared_by")
+
+
+@admin.register(ProductLike)
+class ProductLikeAdmin(admin.ModelAdmin):
+    list_select_related = ("user", "shared_product__product")
+    raw_id_fields = ("user", "shared_product")
@@ -6,9 +6,11 @@ process entries, finished products, and bottles.
 """
 
 from django import forms
+from django.db import transaction
+from django.utils import timezone
 
-from .models import (Batch, BatchIngredient, Bottle, FinishedProduct,
-                     Ingredient, ProcessEntry)
+from .models import (Batch, BatchIngredient, Bottle, BottleCounter,
+                     FinishedProduct, Ingredient, ProcessEntry)
 
 
 class BatchForm(forms.ModelForm):
@@ -29,14 +31,6 @@ class BatchForm(forms.ModelForm):
             "start_date": forms.DateInput(attrs={"type": "date"}),
         }
 
-    def __init__(self, *args, **kwargs):
-        """
-        Set start_gravity as required and middle_gravity as not required.
-        """
-        super().__init__(*args, **kwargs)
-        self.fields["start_gravity"].required = True
-        self.fields["middle_gravity"].required = False
-
 
 class BatchIngredientForm(forms.ModelForm):
     """
@@ -105,14 +99,76 @@ class BatchIngredientForm(forms.ModelForm):
             instance.save()
         return instance
 
+    @staticmethod
+    def save_formset(formset, batch):
+        """
+        Saves the ingredients of a formset to a batch in bulk.
+
+        New ingredient names from all forms are looked up in a single query,
+        the missing ones are created in a single insert, and the batch
+        ingredients are then inserted together, instead of saving each form
+        on its own.
+
+        Args:
+            formset (iterable): The validated forms of the formset.
+            batch (Batch): The batch the ingredients belong to.
+
+        Returns:
+            list: The created BatchIngredient instances.
+        """
+        valid_forms = [
+            form
+            for form in formset
+            if form.cleaned_data and not form.cleaned_data.get("DELETE", False)
+        ]
+        new_names = {
+            form.cleaned_data["new_ingredient"]
+            for form in valid_forms
+            if form.cleaned_data.get("new_ingredient")
+        }
+
+        ingredients = {}
+        if new_names:
+            ingredients = Ingredient.objects.filter(name__in=new_names).in_bulk(
+                field_name="name"
+            )
+            missing = new_names - ingredients.keys()
+            if missing:
+                Ingredient.objects.bulk_create(
+                    [Ingredient(name=name) for name in missing], ignore_conflicts=True
+                )
+                ingredients.update(
+                    Ingredient.objects.filter(name__in=missing).in_bulk(
+                        field_name="name"
+                    )
+                )
+
+        instances = []
+        for form in valid_forms:
+            # The instance was populated from the cleaned data during validation
+            instance = form.instance
+            new_ingredient = form.cleaned_data.get("new_ingredient")
+            if new_ingredient:
+                instance.ingredient = ingredients[new_ingredient]
+            instance.batch = batch
+            instances.append(instance)
+
+        return BatchIngredient.objects.bulk_create(instances, batch_size=500)
+
 
 class ProcessEntryForm(forms.ModelForm):
     """
     A form for creating or editing a ProcessEntry instance.
 
     This form includes fields for the date and description of the process entry.
+    Both are optional so an empty entry can be submitted alongside a batch.
     """
 
+    date = forms.DateField(
+        required=False, widget=forms.DateInput(attrs={"type": "date"})
+    )
+    description = forms.CharField(required=False, widget=forms.Textarea)
+
     class Meta:
         """
         Metaclass for ProcessEntryForm.
@@ -122,9 +178,6 @@ class ProcessEntryForm(forms.ModelForm):
 
         model = ProcessEntry
         fields = ["date", "description"]
-        widgets = {
-            "date": forms.DateInput(attrs={"type": "date"}),
-        }
 
     def clean(self):
         """
@@ -142,19 +195,26 @@ class ProcessEntryForm(forms.ModelForm):
             self.add_error("date", "Date is required when adding a process entry.")
         return cleaned_data
 
-    def __init__(self, *args, **kwargs):
+    @staticmethod
+    def save_formset(formset, batch):
         """
-        Initializes the ProcessEntryForm instance.
-
-        Sets the date and description fields as not required.
+        Saves the process entries of a formset to a batch in a single insert.
 
         Args:
-            *args: Variable length argument list.
-            **kwargs: Arbitrary keyword arguments.
+            formset (iterable): The validated forms of the formset.
+            batch (Batch): The batch the process entries belong to.
+
+        Returns:
+            list: The created ProcessEntry instances.
         """
-        super().__init__(*args, **kwargs)
-        self.fields["date"].required = False
-        self.fields["description"].required = False
+        instances = []
+        for form in formset:
+            if form.cleaned_data:
+                instance = form.instance
+                instance.batch = batch
+                instances.append(instance)
+
+        return ProcessEntry.objects.bulk_create(instances)
 
 
 class FinishBatchForm(forms.ModelForm):
@@ -201,15 +261,31 @@ class BottleForm(forms.ModelForm):
             "date_bottled": forms.DateInput(attrs={"type": "date"}),
         }
 
-    def __init__(self, *args, **kwargs):
+    @staticmethod
+    def save_formset(formset, finished_product):
         """
-        Initializes the BottleForm instance.
+        Saves the bottles of a formset to a finished product in a single insert.
 
-        Sets the date_bottled field as not required.
+        The bottle numbers are reserved in one step for all the bottles, which
+        are then numbered the same way ``Bottle.save`` numbers a single bottle.
 
         Args:
-            *args: Variable length argument list.
-            **kwargs: Arbitrary keyword arguments.
+            formset (iterable): The validated forms of the formset.
+            finished_product (FinishedProduct): The product being bottled.
+
+        Returns:
+            list: The created Bottle instances.
         """
-        super().__init__(*args, **kwargs)
-        self.fields["date_bottled"].required = False
+        instances = [form.instance for form in formset if form.has_changed()]
+        if not instances:
+            return []
+
+        with transaction.atomic():
+            first_number = BottleCounter.reserve(finished_product.id, len(instances))
+            for number, instance in enumerate(instances, start=first_number):
+                instance.finished_product = finished_product
+                instance.bottle_number = f"{finished_product.serial_number}{number:02d}"
+                if not instance.date_bottled:
+                    instance.date_bottled = timezone.localdate()
+
+            return Bottle.objects.bulk_create(instances)
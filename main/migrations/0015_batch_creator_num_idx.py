@@ -0,0 +1,21 @@
+# Generated by Django 5.1 on 2026-10-15 12:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0014_alter_batchingredient_unit"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="batch",
+            index=models.Index(
+                fields=["creator", "batch_number"], name="batch_creator_num_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.1 on 2026-10-15 12:07
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+import django.db.models.functions.math
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0015_batch_creator_num_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="batch",
+            name="abv",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.comparison.Cast(
+                    django.db.models.functions.math.Round(
+                        django.db.models.functions.comparison.Cast(
+                            django.db.models.expressions.CombinedExpression(
+                                django.db.models.expressions.CombinedExpression(
+                                    models.F("start_gravity"),
+                                    "-",
+                                    models.F("final_gravity"),
+                                ),
+                                "*",
+                                models.Value(131.25),
+                            ),
+                            models.DecimalField(decimal_places=4, max_digits=10),
+                        ),
+                        2,
+                    ),
+                    models.FloatField(),
+                ),
+                output_field=models.FloatField(blank=True, null=True),
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.1 on 2026-10-15 12:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def seed_bottle_counters(apps, schema_editor):
+    """
+    Start each product's counter after the highest existing bottle number.
+    """
+    Bottle = apps.get_model("main", "Bottle")
+    BottleCounter = apps.get_model("main", "BottleCounter")
+
+    last_numbers = {}
+    for product_id, serial_number, bottle_number in Bottle.objects.values_list(
+        "finished_product_id", "finished_product__serial_number", "bottle_number"
+    ):
+        number = int(bottle_number[len(serial_number) :])
+        last_numbers[product_id] = max(number, last_numbers.get(product_id, 0))
+
+    BottleCounter.objects.bulk_create(
+        BottleCounter(finished_product_id=product_id, next_number=number + 1)
+        for product_id, number in last_numbers.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0016_batch_abv"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BottleCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("next_number", models.PositiveIntegerField(default=1)),
+                (
+                    "finished_product",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="bottle_counter",
+                        to="main.finishedproduct",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(seed_bottle_counters, migrations.RunPython.noop),
+    ]
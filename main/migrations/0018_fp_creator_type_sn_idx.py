@@ -0,0 +1,22 @@
+# Generated by Django 5.1 on 2026-10-15 12:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0017_bottlecounter"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="finishedproduct",
+            index=models.Index(
+                fields=["creator", "product_type", "serial_number"],
+                name="fp_creator_type_sn_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1 on 2026-10-15 12:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0018_fp_creator_type_sn_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="bottle",
+            index=models.Index(
+                fields=["finished_product", "bottle_number"], name="bottle_fp_num_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1 on 2026-10-15 12:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0019_bottle_fp_num_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="productlike",
+            unique_together=set(),
+        ),
+        migrations.AddIndex(
+            model_name="productlike",
+            index=models.Index(
+                fields=["shared_product", "-created_at"], name="pl_sp_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="productlike",
+            index=models.Index(
+                fields=["user", "-created_at"], name="pl_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sharedproduct",
+            index=models.Index(
+                fields=["shared_by", "-shared_date"], name="sp_by_date_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="productlike",
+            constraint=models.UniqueConstraint(
+                fields=("user", "shared_product"), name="productlike_uniq"
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1 on 2026-10-15 12:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0020_productlike_constraints"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="batch",
+            name="batch_number",
+            field=models.CharField(editable=False, max_length=16, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="bottle",
+            name="bottle_number",
+            field=models.CharField(editable=False, max_length=22, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="finishedproduct",
+            name="serial_number",
+            field=models.CharField(editable=False, max_length=20, unique=True),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1 on 2026-10-15 12:27
+
+from django.db import migrations
+
+
+def remove_duplicate_shares(apps, schema_editor):
+    """
+    Keep the first share of each product by each user, moving the likes of
+    any later duplicates onto it.
+    """
+    SharedProduct = apps.get_model("main", "SharedProduct")
+    ProductLike = apps.get_model("main", "ProductLike")
+
+    first_shares = {}
+    duplicates = {}
+    for share_id, product_id, user_id in SharedProduct.objects.order_by(
+        "id"
+    ).values_list("id", "product_id", "shared_by_id"):
+        first_id = first_shares.setdefault((product_id, user_id), share_id)
+        if first_id != share_id:
+            duplicates[share_id] = first_id
+
+    for duplicate_id, first_id in duplicates.items():
+        liked_by = ProductLike.objects.filter(shared_product_id=first_id).values(
+            "user_id"
+        )
+        ProductLike.objects.filter(shared_product_id=duplicate_id).exclude(
+            user_id__in=liked_by
+        ).update(shared_product_id=first_id)
+    SharedProduct.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+    """
+    Remove duplicate shares ahead of the unique constraint added in 0023.
+
+    This runs in its own migration so that, on PostgreSQL, the deferred
+    foreign key checks triggered by the deletes and updates are resolved when
+    this transaction commits, before the constraint alters the table.
+    """
+
+    dependencies = [
+        ("main", "0021_narrow_identifier_lengths"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_shares, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1 on 2026-10-15 12:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0022_dedupe_shares"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="sharedproduct",
+            constraint=models.UniqueConstraint(
+                fields=("product", "shared_by"), name="sharedproduct_uniq"
+            ),
+        ),
+    ]
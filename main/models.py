@@ -8,18 +8,19 @@ Contains the following models:
 - BatchIngredient: Represents an ingredient used in a batch.
 - ProcessEntry: Represents a process entry for a batch.
 - FinishedProduct: Represents a finished product in the system.
+- BottleCounter: Holds the next bottle number for a finished product.
 - Bottle: Represents a bottle of a finished product.
 - SharedProduct: Represents a finished product that has been shared with other users.
 - ProductLike: Represents a user's like for a shared product.
 
 """
 
-from datetime import datetime
-
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import models
-from django.db.models import Max
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, IntegerField, Max, Value
+from django.db.models.functions import Cast, Right, Round, StrIndex, Substr
+from django.utils import timezone
 
 
 class Ingredient(models.Model):
@@ -38,6 +39,18 @@ class Ingredient(models.Model):
         return self.name
 
 
+class BatchManager(models.Manager):
+    """
+    Default manager for batches.
+
+    Joins the creator in the same query, since a batch is rarely displayed
+    without it.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("creator")
+
+
 class Batch(models.Model):
     """
     Represents a batch of a product.
@@ -51,6 +64,8 @@ class Batch(models.Model):
        final_gravity (float): The final gravity of the batch (optional).
        ingredients (ManyToManyField): The ingredients used in the batch.
        is_finished (bool): Whether the batch is finished.
+       abv (float): The ABV (alcohol by volume) of the batch, computed by the
+           database from the start and final gravity (None if not calculable).
     """
 
     creator = models.ForeignKey(
@@ -58,43 +73,60 @@ class Batch(models.Model):
         on_delete=models.CASCADE,
         related_name="created_batches",
     )
-    batch_number = models.CharField(max_length=50, unique=True, editable=False)
+    batch_number = models.CharField(max_length=16, unique=True, editable=False)
     start_date = models.DateField()
     start_gravity = models.FloatField()
     middle_gravity = models.FloatField(null=True, blank=True)
     final_gravity = models.FloatField(null=True, blank=True)
     ingredients = models.ManyToManyField(Ingredient, through="BatchIngredient")
     is_finished = models.BooleanField(default=False)
+    # Stored by the database; NULL until the final gravity is known. Rounded
+    # through numeric because ROUND() doesn't accept a precision for floats
+    # on PostgreSQL.
+    abv = models.GeneratedField(
+        expression=Cast(
+            Round(
+                Cast(
+                    (F("start_gravity") - F("final_gravity")) * 131.25,
+                    models.DecimalField(max_digits=10, decimal_places=4),
+                ),
+                2,
+            ),
+            models.FloatField(),
+        ),
+        output_field=models.FloatField(null=True, blank=True),
+        db_persist=True,
+    )
+
+    objects = BatchManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["creator", "batch_number"], name="batch_creator_num_idx"
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.batch_number:
-            last_batch = (
-                Batch.objects.filter(creator=self.creator)
-                .order_by("-batch_number")
-                .first()
+            # Compare the numeric suffix after the "-" rather than the whole
+            # string, so "7-10000" sorts after "7-9999".
+            suffix = Cast(
+                Substr("batch_number", StrIndex("batch_number", Value("-")) + 1),
+                IntegerField(),
             )
-            if last_batch:
-                last_number = int(last_batch.batch_number.split("-")[-1])
-                self.batch_number = f"{self.creator.id}-{last_number + 1:04d}"
-            else:
-                self.batch_number = f"{self.creator.id}-0001"
+            last_number = Batch.objects.filter(creator_id=self.creator_id).aggregate(
+                last_number=Max(suffix)
+            )["last_number"]
+            self.batch_number = f"{self.creator_id}-{(last_number or 0) + 1:04d}"
 
         super().save(*args, **kwargs)
 
-    @property
-    def abv(self):
-        """
-        Calculates the ABV (alcohol by volume) of the batch.
-
-        Returns:
-            float: The ABV of the batch, or None if not calculable.
-        """
-        if self.start_gravity and self.final_gravity:
-            return round((self.start_gravity - self.final_gravity) * 131.25, 2)
-        return None
-
     def __str__(self):
-        return f"Batch {self.batch_number} - {self.creator.username}"
+        # Avoid a query per batch when the creator hasn't been loaded
+        if Batch.creator.is_cached(self):
+            return f"Batch {self.batch_number} - {self.creator.username}"
+        return f"Batch {self.batch_number} - {self.creator_id}"
 
 
 class BatchIngredient(models.Model):
@@ -150,6 +182,8 @@ class FinishedProduct(models.Model):
 
     Attributes:
         PRODUCT_TYPES (list): A list of valid product types.
+        SERIAL_NUMBER_ATTEMPTS (int): How many times to retry allocating a
+            serial number when a concurrent save claims it first.
         batch (Batch): The batch that this finished product belongs to.
         product_type (str): The type of product (e.g. WINE, MEAD).
         serial_number (str): A unique serial number for the product.
@@ -163,6 +197,7 @@ class FinishedProduct(models.Model):
         ("WINE", "Wine"),
         ("MEAD", "Mead"),
     ]
+    SERIAL_NUMBER_ATTEMPTS = 3
 
     batch = models.OneToOneField(
         Batch, on_delete=models.CASCADE, related_name="finished_product"
@@ -173,44 +208,119 @@ class FinishedProduct(models.Model):
         on_delete=models.CASCADE,
         related_name="finished_products",
     )
-    serial_number = models.CharField(max_length=50, unique=True, editable=False)
+    serial_number = models.CharField(max_length=20, unique=True, editable=False)
     start_date = models.DateField()
     finish_date = models.DateField()
     description = models.TextField(blank=True)
     abv = models.FloatField(verbose_name="ABV (%)")
 
-    def save(self, *args, **kwargs):
-        if not self.serial_number:
-            # Get the last serial number for this user and product type
-            last_product = FinishedProduct.objects.filter(
-                batch__creator=self.batch.creator, product_type=self.product_type
-            ).aggregate(Max("serial_number"))["serial_number__max"]
-
-            if last_product:
-                # Extract the number part and increment it
-                last_number = int(last_product[-4:])
-                new_number = last_number + 1
-            else:
-                new_number = 1
-
-            # Keep trying new serial numbers until we find an unused one
-            while True:
-                self.serial_number = f"{self.start_date.strftime('%Y%m')}{self.product_type}{new_number:04d}"
-                if not FinishedProduct.objects.filter(
-                    serial_number=self.serial_number
-                ).exists():
-                    break
-                new_number += 1
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["creator", "product_type", "serial_number"],
+                name="fp_creator_type_sn_idx",
+            ),
+        ]
+
+    def _next_serial_number(self):
+        """
+        Returns the next free serial number for the creator and product type.
+
+        Serial numbers are numbered per user but unique across all users, so
+        numbers already taken by other users under the same prefix are skipped.
+        """
+        prefix = f"{self.start_date.strftime('%Y%m')}{self.product_type}"
+        suffix = Cast(Right("serial_number", 4), IntegerField())
+
+        last_number = FinishedProduct.objects.filter(
+            creator_id=self.creator_id, product_type=self.product_type
+        ).aggregate(last_number=Max(suffix))["last_number"]
+        new_number = (last_number or 0) + 1
+
+        taken = set(
+            FinishedProduct.objects.filter(serial_number__startswith=prefix)
+            .annotate(number=suffix)
+            .filter(number__gte=new_number)
+            .values_list("number", flat=True)
+        )
+        while new_number in taken:
+            new_number += 1
+
+        return f"{prefix}{new_number:04d}"
 
+    def save(self, *args, **kwargs):
         if not self.abv:
             self.abv = self.batch.abv or 0
 
-        super().save(*args, **kwargs)
+        if self.serial_number:
+            super().save(*args, **kwargs)
+            return
+
+        # A concurrent save may claim the same serial number between the lookup
+        # and the insert; the unique constraint catches it and we retry. Any
+        # other integrity error (e.g. the batch already being finished) is
+        # raised straight away.
+        for attempt in range(self.SERIAL_NUMBER_ATTEMPTS):
+            self.serial_number = self._next_serial_number()
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                serial_taken = FinishedProduct.objects.filter(
+                    serial_number=self.serial_number
+                ).exists()
+                if not serial_taken or attempt == self.SERIAL_NUMBER_ATTEMPTS - 1:
+                    raise
 
     def __str__(self):
         return f"{self.get_product_type_display()} - {self.serial_number} (ABV: {self.abv}%)"
 
 
+class BottleCounter(models.Model):
+    """
+    Holds the next bottle number for a finished product.
+
+    Bottle numbers are allocated by locking and incrementing this row, so
+    concurrent bottlings of the same product never receive the same number.
+
+    Attributes:
+        finished_product (FinishedProduct): The finished product being bottled.
+        next_number (int): The number the next bottle will receive.
+    """
+
+    finished_product = models.OneToOneField(
+        FinishedProduct, on_delete=models.CASCADE, related_name="bottle_counter"
+    )
+    next_number = models.PositiveIntegerField(default=1)
+
+    @classmethod
+    def reserve(cls, finished_product_id, count=1):
+        """
+        Reserves a run of bottle numbers for a finished product.
+
+        Must be called inside a transaction; the counter row stays locked
+        until it commits.
+
+        Args:
+            finished_product_id (int): The ID of the finished product.
+            count (int): How many consecutive numbers to reserve.
+
+        Returns:
+            int: The first reserved number.
+        """
+        counter, created = cls.objects.select_for_update().get_or_create(
+            finished_product_id=finished_product_id
+        )
+        first_number = counter.next_number
+        counter.next_number = F("next_number") + count
+        counter.save(update_fields=["next_number"])
+        return first_number
+
+    def __str__(self):
+        return f"Next bottle {self.next_number} of {self.finished_product_id}"
+
+
 class Bottle(models.Model):
     """
     Represents a bottle of a finished product.
@@ -225,30 +335,29 @@ class Bottle(models.Model):
     finished_product = models.ForeignKey(
         FinishedProduct, on_delete=models.CASCADE, related_name="bottles"
     )
-    bottle_number = models.CharField(max_length=50, unique=True, editable=False)
+    bottle_number = models.CharField(max_length=22, unique=True, editable=False)
     volume = models.FloatField(help_text="Volume in liters")
     date_bottled = models.DateField(null=True, blank=True)
 
-    def save(self, *args, **kwargs):
-        if not self.bottle_number:
-            last_bottle = (
-                Bottle.objects.filter(finished_product=self.finished_product)
-                .order_by("-bottle_number")
-                .first()
-            )
-            if last_bottle:
-                last_number = int(last_bottle.bottle_number[-2:])
-                new_number = last_number + 1
-            else:
-                new_number = 1
-            self.bottle_number = (
-                f"{self.finished_product.serial_number}{new_number:02d}"
-            )
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["finished_product", "bottle_number"], name="bottle_fp_num_idx"
+            ),
+        ]
 
+    def save(self, *args, **kwargs):
         if not self.date_bottled:
-            self.date_bottled = datetime.now().date()
+            self.date_bottled = timezone.localdate()
 
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            if not self.bottle_number:
+                new_number = BottleCounter.reserve(self.finished_product_id)
+                self.bottle_number = (
+                    f"{self.finished_product.serial_number}{new_number:02d}"
+                )
+
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Bottle {self.bottle_number} of {self.finished_product}"
@@ -273,6 +382,16 @@ class SharedProduct(models.Model):
     )
     shared_date = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "shared_by"], name="sharedproduct_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["shared_by", "-shared_date"], name="sp_by_date_idx"),
+        ]
+
     def __str__(self):
         return f"{self.product} shared by {self.shared_by}"
 
@@ -294,7 +413,17 @@ class ProductLike(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        unique_together = ("user", "shared_product")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "shared_product"], name="productlike_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["shared_product", "-created_at"], name="pl_sp_created_idx"
+            ),
+            models.Index(fields=["user", "-created_at"], name="pl_user_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} likes {self.shared_product.product.serial_number}"
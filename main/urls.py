@@ -15,7 +15,7 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
-from django.urls import path
+from django.urls import include, path
 
 from . import views
 
@@ -24,65 +24,87 @@ app_name = "main"
 urlpatterns = [
     path("", views.home_view, name="home"),
     path("user_home/", views.user_home_view, name="user_home"),
+    path(
+        "<str:object_type>/<int:object_id>/qr-code/",
+        views.generate_qr_code,
+        name="generate_qr_code",
+    ),
+    path(
+        "bottle/<int:product_id>/<int:object_id>/qr-code/",
+        views.generate_qr_code,
+        {"object_type": "bottle"},
+        name="generate_bottle_qr_code",
+    ),
 ]
 
+# Routes sharing a prefix are grouped with include(), so the resolver only
+# walks a group once its prefix has matched
+
 # batch urls
 
+batch_patterns = [
+    path("", views.view_batch, name="view_batch"),
+    path("edit/", views.edit_batch, name="edit_batch"),
+    path("finish/", views.finish_batch, name="finish_batch"),
+]
+
 urlpatterns += [
-    path("batches/", views.list_batches, name="list_batches"),
-    path("batches/add/", views.add_batch, name="add_batch"),
-    path("batches/<int:batch_id>/", views.view_batch, name="view_batch"),
-    path("batches/<int:batch_id>/edit/", views.edit_batch, name="edit_batch"),
     path(
-        "<str:object_type>/<int:object_id>/qr-code/",
-        views.generate_qr_code,
-        name="generate_qr_code",
+        "batches/",
+        include(
+            [
+                path("", views.list_batches, name="list_batches"),
+                path("add/", views.add_batch, name="add_batch"),
+                path("<int:batch_id>/", include(batch_patterns)),
+            ]
+        ),
     ),
 ]
 
 # finished product urls
 
+bottle_patterns = [
+    path("", views.show_bottle, name="show_bottle"),
+    path("public/", views.public_show_bottle, name="public_show_bottle"),
+]
+
+product_patterns = [
+    path("", views.view_finished_product, name="view_finished_product"),
+    path("share/", views.share_product, name="share_product"),
+    path("bottle/", views.bottle_product, name="bottle_product"),
+    path("bottle/<int:bottle_id>/", include(bottle_patterns)),
+]
+
 urlpatterns += [
-    path("batches/<int:batch_id>/finish/", views.finish_batch, name="finish_batch"),
-    path("products/", views.list_finished_products, name="list_finished_products"),
-    path(
-        "products/<int:product_id>/",
-        views.view_finished_product,
-        name="view_finished_product",
-    ),
     path(
-        "products/<int:product_id>/bottle/", views.bottle_product, name="bottle_product"
-    ),
-    path(
-        "products/<int:product_id>/bottle/<int:bottle_id>/",
-        views.show_bottle,
-        name="show_bottle",
-    ),
-    path(
-        "products/<int:product_id>/bottle/<int:bottle_id>/public/",
-        views.public_show_bottle,
-        name="public_show_bottle",
+        "products/",
+        include(
+            [
+                path("", views.list_finished_products, name="list_finished_products"),
+                path("shared/", views.shared_products, name="shared_products"),
+                path("<int:product_id>/", include(product_patterns)),
+            ]
+        ),
     ),
 ]
 
 # shared product urls
 
 urlpatterns += [
-    path("products/<int:product_id>/share/", views.share_product, name="share_product"),
-    path("products/shared/", views.shared_products, name="shared_products"),
     path(
         "shared-products/<int:product_id>/",
         views.view_shared_product,
         name="view_shared_product",
     ),
     path(
-        "shared-product/<int:shared_product_id>/like/",
-        views.like_shared_product,
-        name="like_shared_product",
-    ),
-    path(
-        "shared-product/<int:shared_product_id>/unlike/",
-        views.unlike_shared_product,
-        name="unlike_shared_product",
+        "shared-product/<int:shared_product_id>/",
+        include(
+            [
+                path("like/", views.like_shared_product, name="like_shared_product"),
+                path(
+                    "unlike/", views.unlike_shared_product, name="unlike_shared_product"
+                ),
+            ]
+        ),
     ),
 ]
@@ -1,17 +1,24 @@
+import hashlib
 import logging
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
 
 import qrcode
+import qrcode.image.svg
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.db import transaction
-from django.db.models import Count
+from django.db.models import Count, Exists, OuterRef
 from django.forms import modelformset_factory
 from django.http import HttpResponse, JsonResponse
-from django.shortcuts import get_object_or_404, redirect, render
-from django.urls import reverse
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
+from django.urls import get_script_prefix, reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.cache import cache_control
 from django.views.decorators.http import require_POST
+from django.views.decorators.vary import vary_on_cookie
 
 from .forms import (
     BatchForm,
@@ -33,10 +40,47 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+# How long generated QR codes are kept in the cache and by the browser, in seconds
+QR_CODE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Columns rendered by the batch and bottle pages, used to narrow their queries
+BATCH_DISPLAY_FIELDS = (
+    "batch_number",
+    "start_date",
+    "start_gravity",
+    "middle_gravity",
+    "final_gravity",
+    "is_finished",
+    "abv",
+)
+PRODUCT_DISPLAY_FIELDS = (
+    "product_type",
+    "serial_number",
+    "start_date",
+    "finish_date",
+    "description",
+    "abv",
+)
+
+# Formset classes are built once at import time rather than on every request
+BatchIngredientFormSet = modelformset_factory(
+    BatchIngredient, form=BatchIngredientForm, extra=1, can_delete=True
+)
+EditBatchIngredientFormSet = modelformset_factory(
+    BatchIngredient, form=BatchIngredientForm, extra=1, can_delete=False
+)
+ProcessEntryFormSet = modelformset_factory(
+    ProcessEntry, form=ProcessEntryForm, extra=1, can_delete=False
+)
+BottleFormSet = modelformset_factory(Bottle, form=BottleForm, extra=1, can_delete=False)
 
-def home_view(request):
+
+async def home_view(request):
     """
     Just a simple view to display the main application home page.
+
+    It doesn't touch the database, so it is served without a worker thread
+    when running under ASGI.
     """
     return render(request, "main_home.html")
 
@@ -65,11 +109,6 @@ def add_batch(request):
     :return: A redirect to the batch details page on success, or a rendered
              template with form errors on failure.
     """
-    # Formsets for ingredients and processes
-    BatchIngredientFormSet = modelformset_factory(
-        BatchIngredient, form=BatchIngredientForm, extra=1, can_delete=True
-    )
-
     if request.method == "POST":
         batch_form = BatchForm(request.POST)
         ingredient_formset = BatchIngredientFormSet(
@@ -78,29 +117,26 @@ def add_batch(request):
         process_form = ProcessEntryForm(request.POST)
 
         if batch_form.is_valid() and ingredient_formset.is_valid():
-            # Save the batch
-            batch = batch_form.save(commit=False)
-            batch.creator = request.user
-            batch.save()
-
-            # Save each ingredient from the formset
-            for form in ingredient_formset:
-                if form.cleaned_data and not form.cleaned_data.get("DELETE", False):
-                    batch_ingredient = form.save(commit=False)
-                    batch_ingredient.batch = batch
-                    batch_ingredient.save()
-
-            # Only save the process entry if the form has data
-            if process_form.has_changed():
-                if process_form.is_valid():
-                    process_entry = process_form.save(commit=False)
-                    process_entry.batch = batch
-                    process_entry.save()
-                else:
-                    messages.warning(
-                        request,
-                        "Process entry was not saved due to invalid data. You can add it later.",
-                    )
+            # Save the batch, its ingredients and process entry together
+            with transaction.atomic():
+                batch = batch_form.save(commit=False)
+                batch.creator = request.user
+                batch.save()
+
+                # Save the ingredients from the formset in bulk
+                BatchIngredientForm.save_formset(ingredient_formset, batch)
+
+                # Only save the process entry if the form has data
+                if process_form.has_changed():
+                    if process_form.is_valid():
+                        process_entry = process_form.save(commit=False)
+                        process_entry.batch = batch
+                        process_entry.save()
+                    else:
+                        messages.warning(
+                            request,
+                            "Process entry was not saved due to invalid data. You can add it later.",
+                        )
 
             messages.success(request, "Batch created successfully!")
             return redirect("main:view_batch", batch_id=batch.id)
@@ -128,6 +164,16 @@ def add_batch(request):
     return render(request, "add_batch.html", context)
 
 
+def _posted_ids(request, name):
+    """
+    Return the integer IDs posted under the given name, ignoring any values
+    that aren't IDs.
+    """
+    return tuple(
+        int(value) for value in request.POST.getlist(name) if value.isdecimal()
+    )
+
+
 @login_required
 def edit_batch(request, batch_id):
     """
@@ -140,21 +186,16 @@ def edit_batch(request, batch_id):
     Returns:
         HttpResponse: The rendered HTML template for the edit batch page.
     """
-    # Get the batch object with the given ID and creator
-    batch = get_object_or_404(Batch, id=batch_id, creator=request.user)
-
-    # Create formsets for BatchIngredient and ProcessEntry
-    BatchIngredientFormSet = modelformset_factory(
-        BatchIngredient, form=BatchIngredientForm, extra=1, can_delete=False
-    )
-    ProcessEntryFormSet = modelformset_factory(
-        ProcessEntry, form=ProcessEntryForm, extra=1, can_delete=False
+    # Get the batch object with the given ID and creator. The creator is the
+    # current user, so it isn't joined
+    batch = get_object_or_404(
+        Batch.objects.select_related(None), id=batch_id, creator=request.user
     )
 
     if request.method == "POST":
         # Create form instances with the request data
         batch_form = BatchForm(request.POST, instance=batch)
-        ingredient_formset = BatchIngredientFormSet(
+        ingredient_formset = EditBatchIngredientFormSet(
             request.POST, queryset=BatchIngredient.objects.none(), prefix="ingredients"
         )
         process_formset = ProcessEntryFormSet(
@@ -166,36 +207,36 @@ def edit_batch(request, batch_id):
             and ingredient_formset.is_valid()
             and process_formset.is_valid()
         ):
-            batch = batch_form.save()
-
-            # Handle deleted ingredients
-            deleted_ingredients = request.POST.getlist("delete_ingredient")
-            BatchIngredient.objects.filter(id__in=deleted_ingredients).delete()
-
-            # Handle deleted process entries
-            deleted_processes = request.POST.getlist("delete_process")
-            ProcessEntry.objects.filter(id__in=deleted_processes).delete()
-
-            # Save new ingredients
-            for form in ingredient_formset:
-                if form.cleaned_data:
-                    ingredient = form.save(commit=False)
-                    ingredient.batch = batch
-                    ingredient.save()
-
-            # Save new process entries
-            for form in process_formset:
-                if form.cleaned_data:
-                    process = form.save(commit=False)
-                    process.batch = batch
-                    process.save()
+            # Apply all the changes in a single transaction
+            with transaction.atomic():
+                batch = batch_form.save()
+
+                # Handle deleted ingredients
+                deleted_ingredients = _posted_ids(request, "delete_ingredient")
+                if deleted_ingredients:
+                    BatchIngredient.objects.filter(
+                        batch=batch, id__in=deleted_ingredients
+                    ).delete()
+
+                # Handle deleted process entries
+                deleted_processes = _posted_ids(request, "delete_process")
+                if deleted_processes:
+                    ProcessEntry.objects.filter(
+                        batch=batch, id__in=deleted_processes
+                    ).delete()
+
+                # Save new ingredients
+                BatchIngredientForm.save_formset(ingredient_formset, batch)
+
+                # Save new process entries in bulk
+                ProcessEntryForm.save_formset(process_formset, batch)
 
             return redirect("main:view_batch", batch_id=batch.id)
 
     else:
         # Create form instances with the initial data
         batch_form = BatchForm(instance=batch)
-        ingredient_formset = BatchIngredientFormSet(
+        ingredient_formset = EditBatchIngredientFormSet(
             queryset=BatchIngredient.objects.none(), prefix="ingredients"
         )
         process_formset = ProcessEntryFormSet(
@@ -213,6 +254,8 @@ def edit_batch(request, batch_id):
 
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@vary_on_cookie
 def view_batch(request, batch_id):
     """
     View to handle the viewing of a batch.
@@ -224,8 +267,16 @@ def view_batch(request, batch_id):
     Returns:
         HttpResponse: The rendered HTML template for the view batch page.
     """
-    # Get the batch object with the given ID and user
-    batch = get_object_or_404(Batch, id=batch_id, creator=request.user)
+    # Get the batch object with the given ID and user, loading only the
+    # columns the template shows and the finished product it links to, with
+    # its ingredients pre-fetched
+    batch = get_object_or_404(
+        Batch.objects.select_related("finished_product")
+        .only(*BATCH_DISPLAY_FIELDS, "creator__username", "finished_product__id")
+        .prefetch_related("batchingredient_set__ingredient"),
+        id=batch_id,
+        creator=request.user,
+    )
 
     # Create a dictionary to pass to the template
     context = {
@@ -238,11 +289,13 @@ def view_batch(request, batch_id):
 
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@vary_on_cookie
 def list_batches(request):
     """
     View to handle the listing of batches.
 
-    This view displays a list of all batches created by the user.
+    This view displays a list of the unfinished batches created by the user.
 
     Args:
         request (HttpRequest): The HTTP request object.
@@ -250,9 +303,14 @@ def list_batches(request):
     Returns:
         HttpResponse: The rendered HTML template for the batch list page.
     """
-    # Get all batches created by the user, with their ingredients pre-fetched
-    batches = Batch.objects.filter(creator=request.user).prefetch_related(
-        "batchingredient_set__ingredient"
+    # Get the user's unfinished batches (the only ones the template shows),
+    # with their ingredients pre-fetched
+    # The creator is the current user, so it isn't joined
+    batches = (
+        Batch.objects.filter(creator=request.user, is_finished=False)
+        .select_related(None)
+        .only(*BATCH_DISPLAY_FIELDS)
+        .prefetch_related("batchingredient_set__ingredient")
     )
 
     # Create a dictionary to pass to the template
@@ -276,11 +334,16 @@ def finish_batch(request, batch_id):
     Returns:
         HttpResponse: The rendered HTML template for the finish batch page.
     """
-    batch = get_object_or_404(Batch, id=batch_id, creator=request.user)
+    # The creator is the current user, so it isn't joined
+    batch = get_object_or_404(
+        Batch.objects.select_related(None), id=batch_id, creator=request.user
+    )
 
     if batch.is_finished:
         return redirect("main:view_batch", batch_id=batch_id)
 
+    batch_abv = batch.abv
+
     if request.method == "POST":
         form = FinishBatchForm(request.POST)
         if form.is_valid():
@@ -289,15 +352,15 @@ def finish_batch(request, batch_id):
                     finished_product = form.save(commit=False)
                     finished_product.batch = batch
                     finished_product.creator = request.user  # Set the creator
-                    finished_product.abv = batch.abv or form.cleaned_data.get("abv", 0)
+                    finished_product.abv = batch_abv or form.cleaned_data.get("abv", 0)
 
                     # Combine all process entries into a single description
-                    process_entries = batch.process_entries.all().order_by("date")
+                    process_entries = batch.process_entries.order_by(
+                        "date"
+                    ).values_list("date", "description")
                     combined_process = "\n".join(
-                        [
-                            f"{entry.date}: {entry.description}"
-                            for entry in process_entries
-                        ]
+                        f"{date}: {description}"
+                        for date, description in process_entries
                     )
 
                     finished_product.description = f"{finished_product.description
@@ -320,7 +383,7 @@ def finish_batch(request, batch_id):
             initial={
                 "start_date": batch.start_date,
                 "finish_date": datetime.now().date(),
-                "abv": batch.abv or 0,
+                "abv": batch_abv or 0,
             }
         )
 
@@ -329,6 +392,8 @@ def finish_batch(request, batch_id):
 
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@vary_on_cookie
 def view_finished_product(request, product_id):
     """
     View to handle the display of a finished product.
@@ -344,13 +409,20 @@ def view_finished_product(request, product_id):
     Returns:
         HttpResponse: The rendered HTML template for the view finished product page.
     """
-    # Get the finished product object with the given ID and user
+    # Get the finished product object with the given ID and user, joined with
+    # its batch and with the batch ingredients pre-fetched
     product = get_object_or_404(
-        FinishedProduct, id=product_id, batch__creator=request.user
+        FinishedProduct.objects.select_related("batch").prefetch_related(
+            "batch__batchingredient_set__ingredient"
+        ),
+        id=product_id,
+        batch__creator=request.user,
     )
 
-    # Create a context dictionary to pass to the template
-    context = {"product": product}
+    # Create a context dictionary to pass to the template. The bottles are
+    # passed as one queryset so the template checks and lists them with a
+    # single query.
+    context = {"product": product, "bottles": product.bottles.all()}
 
     # Render the template and return the response
     return render(request, "view_finished_product.html", context)
@@ -379,11 +451,6 @@ def bottle_product(request, product_id):
         FinishedProduct, id=product_id, batch__creator=request.user
     )
 
-    # Create a formset factory for adding bottles
-    BottleFormSet = modelformset_factory(
-        Bottle, form=BottleForm, extra=1, can_delete=False
-    )
-
     if request.method == "POST":
         # Create a formset instance with the request data
         formset = BottleFormSet(request.POST, queryset=Bottle.objects.none())
@@ -393,20 +460,13 @@ def bottle_product(request, product_id):
             # Handle the "add_bottle" action
             if request.POST["action"] == "add_bottle":
                 # Add a new form to the formset
-                BottleFormSet = modelformset_factory(
-                    Bottle,
-                    form=BottleForm,
-                    extra=formset.total_form_count() + 1,
-                    can_delete=False,
-                )
+                extra = formset.total_form_count() + 1
                 formset = BottleFormSet(queryset=Bottle.objects.none())
+                formset.extra = extra
             # Handle the "save_bottles" action
             elif request.POST["action"] == "save_bottles" and formset.is_valid():
-                # Save the bottles
-                instances = formset.save(commit=False)
-                for instance in instances:
-                    instance.finished_product = product
-                    instance.save()
+                # Save the bottles in bulk
+                BottleForm.save_formset(formset, product)
                 # Redirect to the view finished product page
                 return redirect("main:view_finished_product", product_id=product.id)
     else:
@@ -424,12 +484,14 @@ def bottle_product(request, product_id):
 
 # View to handle the listing of finished products
 @login_required
+@cache_control(private=True, no_cache=True)
+@vary_on_cookie
 def list_finished_products(request):
     """
     View to handle the listing of finished products for the current user.
 
-    This view retrieves all finished products for the current user, adds a boolean
-    attribute to each product indicating whether it has been shared, and renders the
+    This view retrieves all finished products for the current user, annotated with
+    whether each product has been shared, and renders the
     list_finished_products.html template with the list of products.
 
     Args:
@@ -438,12 +500,16 @@ def list_finished_products(request):
     Returns:
         HttpResponse: The rendered HTML template for the list finished products page.
     """
-    # Get all finished products for the current user
-    finished_products = FinishedProduct.objects.filter(creator=request.user)
-
-    # Add a boolean attribute to each product indicating whether it has been shared
-    for product in finished_products:
-        product.is_shared = SharedProduct.objects.filter(product=product).exists()
+    # Get all finished products for the current user, with their batch, bottle
+    # count and whether they have been shared, in a single query
+    finished_products = (
+        FinishedProduct.objects.filter(creator=request.user)
+        .select_related("batch")
+        .annotate(
+            bottle_count=Count("bottles"),
+            is_shared=Exists(SharedProduct.objects.filter(product=OuterRef("pk"))),
+        )
+    )
 
     context = {
         "finished_products": finished_products,
@@ -454,6 +520,8 @@ def list_finished_products(request):
 
 # View to handle the display of a specific bottle
 @login_required
+@cache_control(private=True, no_cache=True)
+@vary_on_cookie
 def show_bottle(request, product_id, bottle_id):
     """
     View to handle the display of a specific bottle.
@@ -469,12 +537,22 @@ def show_bottle(request, product_id, bottle_id):
     Returns:
         HttpResponse: The rendered HTML template for the show bottle page.
     """
-    # Get the product object with the given ID and user
-    product = get_object_or_404(
-        FinishedProduct, id=product_id, batch__creator=request.user
+    # Get the bottle with its product and batch in one query, checking that
+    # the product belongs to the user
+    bottle = get_object_or_404(
+        Bottle.objects.select_related("finished_product__batch").only(
+            "bottle_number",
+            "volume",
+            "date_bottled",
+            *(f"finished_product__{field}" for field in PRODUCT_DISPLAY_FIELDS),
+            "finished_product__batch__batch_number",
+            "finished_product__batch__start_date",
+        ),
+        id=bottle_id,
+        finished_product_id=product_id,
+        finished_product__batch__creator=request.user,
     )
-    # Get the bottle object with the given ID and product
-    bottle = get_object_or_404(Bottle, id=bottle_id, finished_product=product)
+    product = bottle.finished_product
 
     # Create a context dictionary to pass to the template
     context = {
@@ -486,22 +564,41 @@ def show_bottle(request, product_id, bottle_id):
     return render(request, "show_bottle.html", context)
 
 
+@lru_cache(maxsize=1024)
+def _cached_reverse(script_prefix, url_name, kwargs_items):
+    """
+    Memoized ``reverse()`` for the QR code URLs.
+
+    Args:
+        script_prefix (str): The current script prefix, which ``reverse()``
+            prepends to the path and so is part of the cache key.
+        url_name (str): The name of the URL pattern.
+        kwargs_items (tuple): The sorted (name, value) pairs of the URL kwargs.
+
+    Returns:
+        str: The path of the URL.
+    """
+    return reverse(url_name, kwargs=dict(kwargs_items))
+
+
 # View to handle the generation of a QR code for a specific object
 @login_required
-def generate_qr_code(request, object_type, object_id):
+def generate_qr_code(request, object_type, object_id, product_id=None):
     """
     View to handle the generation of a QR code for a specific object.
 
     This view generates a QR code for the given object type and ID, and returns
-    the QR code image as a PNG response.
+    the QR code image as an SVG response.
 
     Args:
         request (HttpRequest): The current request object.
         object_type (str): The type of object to generate the QR code for (e.g. batch, finished_product, bottle).
         object_id (int): The ID of the object to generate the QR code for.
+        product_id (int, optional): The ID of the bottle's finished product. When
+            given for a bottle, the URL is built without a database query.
 
     Returns:
-        HttpResponse: The QR code image as a PNG response.
+        HttpResponse: The QR code image as an SVG response.
     """
     # Determine the URL name based on the object type
     if object_type == "batch":
@@ -512,33 +609,57 @@ def generate_qr_code(request, object_type, object_id):
         kwargs = {"product_id": object_id}
     elif object_type == "bottle":
         url_name = "main:public_show_bottle"
-        bottle = get_object_or_404(Bottle, id=object_id)
-        kwargs = {"product_id": bottle.finished_product.id, "bottle_id": object_id}
+        if product_id is None:
+            # The generic URL doesn't carry the product, so look it up
+            product_id = get_object_or_404(
+                Bottle.objects.values_list("finished_product_id", flat=True),
+                id=object_id,
+            )
+        kwargs = {"product_id": product_id, "bottle_id": object_id}
     else:
         # Return an error response if the object type is invalid
         return HttpResponse("Invalid object type", status=400)
 
     # Build the absolute URL for the object
-    object_url = request.build_absolute_uri(reverse(url_name, kwargs=kwargs))
-
-    # Create a QR code object
-    qr = qrcode.QRCode(version=1, box_size=10, border=5)
-    # Add the object URL to the QR code
-    qr.add_data(object_url)
-    # Make the QR code fit the data
-    qr.make(fit=True)
-    # Create a QR code image
-    img = qr.make_image(fill_color="black", back_color="white")
-
-    # Create a BytesIO buffer to store the image
-    buffer = BytesIO()
-    # Save the image to the buffer
-    img.save(buffer, format("PNG"))
-    # Return the image as a PNG response
-    return HttpResponse(buffer.getvalue(), content_type="image/png")
-
+    object_url = request.build_absolute_uri(
+        _cached_reverse(get_script_prefix(), url_name, tuple(sorted(kwargs.items())))
+    )
 
-def public_show_bottle(request, product_id, bottle_id):
+    # The image only depends on the encoded URL, so its digest serves as both
+    # the ETag and part of the cache key
+    digest = hashlib.md5(object_url.encode()).hexdigest()
+    etag = f'"svg-{digest}"'
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    cache_key = f"qr:svg:{object_type}:{object_id}:{digest}"
+    svg = cache.get(cache_key)
+    if svg is None:
+        # Create a QR code object
+        qr = qrcode.QRCode(version=1, box_size=10, border=5)
+        # Add the object URL to the QR code
+        qr.add_data(object_url)
+        # Make the QR code fit the data
+        qr.make(fit=True)
+        # Create a QR code image as an SVG path on a white background
+        img = qr.make_image(image_factory=qrcode.image.svg.SvgPathFillImage)
+
+        # Create a BytesIO buffer to store the image
+        buffer = BytesIO()
+        # Save the image to the buffer
+        img.save(buffer)
+        svg = buffer.getvalue()
+        cache.set(cache_key, svg, QR_CODE_CACHE_TIMEOUT)
+
+    # Return the image as an SVG response
+    response = HttpResponse(svg, content_type="image/svg+xml")
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, max_age=QR_CODE_CACHE_TIMEOUT)
+    return response
+
+
+async def public_show_bottle(request, product_id, bottle_id):
     """
     View to handle the display of a specific bottle.
 
@@ -553,9 +674,14 @@ def public_show_bottle(request, product_id, bottle_id):
     Returns:
         HttpResponse: The rendered HTML template for the show bottle page.
     """
-    # Get the bottle object with the given ID
-    product = get_object_or_404(FinishedProduct, id=product_id)
-    bottle = get_object_or_404(Bottle, id=bottle_id, finished_product=product)
+    # Get the bottle with its product and batch in one query, using the async
+    # ORM since this page is opened by anyone scanning a bottle's QR code
+    bottle = await aget_object_or_404(
+        Bottle.objects.select_related("finished_product__batch"),
+        id=bottle_id,
+        finished_product_id=product_id,
+    )
+    product = bottle.finished_product
     batch = product.batch
 
     # Create a context dictionary to pass to the template
@@ -597,18 +723,19 @@ def shared_products(request):
     """
     View to handle the list of all shared finished products.
     """
-    # Retrieve all shared finished products, excluding those shared by the current user
-    all_shared = SharedProduct.objects.exclude(shared_by=request.user).select_related(
-        "product", "shared_by"
+    # Retrieve all shared finished products, excluding those shared by the
+    # current user, most liked first. The list is fetched with a single query
+    # and split in Python.
+    all_shared = list(
+        SharedProduct.objects.exclude(shared_by=request.user)
+        .select_related("product", "shared_by")
+        .annotate(likes_count=Count("likes"))
+        .order_by("-likes_count", "-shared_date")
     )
 
-    # Get the top 10 most liked products
-    top_liked = all_shared.annotate(likes_count=Count("likes")).order_by(
-        "-likes_count"
-    )[:10]
-
-    # Get the rest of the shared products
-    other_shared = all_shared.exclude(id__in=top_liked.values_list("id", flat=True))
+    # The top 10 most liked products, then the rest
+    top_liked = all_shared[:10]
+    other_shared = all_shared[10:]
 
     # Create a context dictionary to pass to the template
     context = {
@@ -625,28 +752,45 @@ def view_shared_product(request, product_id):
     """
     View to display details of a shared product.
     """
-    shared_product = get_object_or_404(SharedProduct, product_id=product_id)
+    # Fetch the shared product together with its like count and whether the
+    # current user has liked it
+    shared_product = get_object_or_404(
+        SharedProduct.objects.select_related("product", "shared_by").annotate(
+            likes_count=Count("likes"),
+            user_liked=Exists(
+                ProductLike.objects.filter(
+                    shared_product=OuterRef("pk"), user=request.user
+                )
+            ),
+        ),
+        product_id=product_id,
+    )
     product = shared_product.product
 
     # Check if the current user is the one who shared the product
-    if shared_product.shared_by == request.user:
+    if shared_product.shared_by_id == request.user.id:
         return redirect("main:view_finished_product", product_id=product_id)
 
-    # Check if the current user has liked this product
-    user_has_liked = shared_product.likes.filter(user=request.user).exists()
-    likes_count = shared_product.likes.count()
-
     context = {
         "product": product,
         "shared_by": shared_product.shared_by,
         "shared_date": shared_product.shared_date,
-        "user_has_liked": user_has_liked,
-        "likes_count": likes_count,
+        "user_has_liked": shared_product.user_liked,
+        "likes_count": shared_product.likes_count,
         "shared_product_id": shared_product.id,
     }
     return render(request, "view_shared_product.html", context)
 
 
+def _likes_count(shared_product_id):
+    """
+    Return the number of likes of a shared product with a single aggregate.
+    """
+    return SharedProduct.objects.filter(id=shared_product_id).aggregate(
+        count=Count("likes")
+    )["count"]
+
+
 @login_required
 @require_POST
 def like_shared_product(request, shared_product_id):
@@ -665,13 +809,15 @@ def like_shared_product(request, shared_product_id):
         JsonResponse: A JSON response containing the updated like count.
     """
     shared_product = get_object_or_404(SharedProduct, id=shared_product_id)
-    like, created = ProductLike.objects.get_or_create(
-        user=request.user, shared_product=shared_product
+    # A single INSERT that does nothing if the user already liked the product
+    ProductLike.objects.bulk_create(
+        [ProductLike(user=request.user, shared_product=shared_product)],
+        ignore_conflicts=True,
     )
 
     if request.headers.get("x-requested-with") == "XMLHttpRequest":
-        return JsonResponse({"likes_count": shared_product.likes.count()})
-    return redirect("main:view_shared_product", product_id=shared_product.product.id)
+        return JsonResponse({"likes_count": _likes_count(shared_product_id)})
+    return redirect("main:view_shared_product", product_id=shared_product.product_id)
 
 
 @login_required
@@ -699,6 +845,6 @@ def unlike_shared_product(request, shared_product_id):
 
     if request.headers.get("x-requested-with") == "XMLHttpRequest":
         # Return a JSON response with the updated like count
-        return JsonResponse({"likes_count": shared_product.likes.count()})
+        return JsonResponse({"likes_count": _likes_count(shared_product_id)})
     # Redirect to the view shared product page if the request is not an AJAX call
-    return redirect("main:view_shared_product", product_id=shared_product.product.id)
+    return redirect("main:view_shared_product", product_id=shared_product.product_id)